@@ -1,12 +1,17 @@
-from typing import Union, Optional, TYPE_CHECKING, Any
+from typing import Union, Optional, TYPE_CHECKING, Any, Dict, Callable, List, Iterator
 import enum
+import functools
+import io
+import sys
+
+from xml.etree import ElementTree
 
-from xml.dom import minidom
 from systemrdl.node import AddressableNode, RootNode, Node
 from systemrdl.node import AddrmapNode, MemNode
 from systemrdl.node import RegNode, RegfileNode, FieldNode
 
 from . import typemaps
+from .xml_writer import XMLWriter
 
 if TYPE_CHECKING:
     from systemrdl.messages import MessageHandler
@@ -28,8 +33,87 @@ class Standard(enum.IntEnum):
         return self == Standard.IEEE_1685_2014
 
 
+# Namespace URIs and their conventional prefixes for each standard
+NAMESPACES = {
+    Standard.IEEE_1685_2009: ("spirit", "http://www.spiritconsortium.org/XMLSchema/SPIRIT/1685-2009"),
+    Standard.IEEE_1685_2014: ("ipxact", "http://www.accellera.org/XMLSchema/IPXACT/1685-2014"),
+}
+XSI_NS = "http://www.w3.org/2001/XMLSchema-instance"
+XML_NS = "http://www.w3.org/XML/1998/namespace"
+
+# Namespace-prefixed tag names for each standard, so that they do not need to
+# be built for every element that is written
+TAG_NAMES = (
+    "access",
+    "addressBlock",
+    "addressOffset",
+    "baseAddress",
+    "bitOffset",
+    "bitWidth",
+    "component",
+    "description",
+    "dim",
+    "displayName",
+    "enumeratedValue",
+    "enumeratedValues",
+    "field",
+    "isPresent",
+    "library",
+    "mask",
+    "memoryMap",
+    "memoryMaps",
+    "modifiedWriteValue",
+    "name",
+    "range",
+    "readAction",
+    "register",
+    "registerFile",
+    "reset",
+    "resets",
+    "size",
+    "testable",
+    "usage",
+    "value",
+    "vendor",
+    "version",
+    "volatile",
+    "width",
+)
+TAGS = {
+    std: {name: sys.intern(prefix + ":" + name) for name in TAG_NAMES}
+    for std, (prefix, _) in NAMESPACES.items()
+}
+
+
+# Address offsets, ranges and reset values are often repeated, so cache their
+# formatted strings
+@functools.lru_cache(maxsize=4096)
+def _hex_2014(v: int) -> str:
+    return "'h%x" % v
+
+@functools.lru_cache(maxsize=4096)
+def _hex_2009(v: int) -> str:
+    return "0x%x" % v
+
+def _is_present(node: Node) -> bool:
+    # ispresent defaults to true, and any assignment (including one made
+    # with a 'default' statement) is stored on the instance. Read it directly
+    # instead of going through the get_property() default lookup.
+    return node.inst.properties.get("ispresent", True)
+
+
 #===============================================================================
 class IPXACTExporter:
+    # Name of the method that exports each kind of registerData child.
+    # SystemRDL node classes are never subclassed, so these are looked up by
+    # exact type.
+    _child_handlers = {
+        RegNode: "add_register",
+        RegfileNode: "add_registerFile",
+        AddrmapNode: "add_registerFile",
+        MemNode: "_warn_nested_mem",
+    } # type: Dict[type, str]
+
     def __init__(self, **kwargs: Any) -> None:
         """
         Constructor for the exporter object.
@@ -59,20 +143,52 @@ class IPXACTExporter:
         self.standard = kwargs.pop("standard", None) or Standard.IEEE_1685_2014
         self.xml_indent = kwargs.pop("xml_indent", None) or "  "
         self.xml_newline = kwargs.pop("xml_newline", None) or "\n"
-        self.doc = None # type: minidom.Document
-        self._max_width = None # type: Optional[int]
+        self.xg = None # type: XMLWriter
 
         # Check for stray kwargs
         if kwargs:
             raise TypeError("got an unexpected keyword argument '%s'" % list(kwargs.keys())[0])
 
-        if self.standard >= Standard.IEEE_1685_2014:
-            self.ns = "ipxact:"
-        else:
-            self.ns = "spirit:"
+        self.ns_prefix, self.ns_uri = NAMESPACES[self.standard]
+        self.ns = self.ns_prefix + ":"
+
+        # Namespace-prefixed tag names
+        self.tags = TAGS[self.standard]
+
+        # Tag used for the container passed to the vendorExtensions hooks
+        self._vx_tag = "{%s}vendorExtensions" % self.ns_uri
 
         # If standard supports isPresent tags, don't skip them
         self.skip_not_present = not self.standard.supports_isPresent
+        self._emit_ispresent = self.standard.supports_isPresent
+
+        # 2014 describes resets per field. 2009 only has a per-register reset
+        self._field_resets = self.standard >= Standard.IEEE_1685_2014
+
+        # Bind the standard-specific implementations up-front rather than
+        # re-checking the standard for every node. If a subclass overrides
+        # either method, use its override instead.
+        cls = type(self)
+        if cls.hex_str is not IPXACTExporter.hex_str:
+            self._hex_str = self.hex_str # type: Callable[[int], str]
+        elif self.standard >= Standard.IEEE_1685_2014:
+            self._hex_str = _hex_2014
+        else:
+            self._hex_str = _hex_2009
+
+        if cls.add_registerData is not IPXACTExporter.add_registerData:
+            self._add_registerData = self.add_registerData # type: Callable[[Node], None]
+        elif self.standard >= Standard.IEEE_1685_2014:
+            self._add_registerData = self._add_registerData_2014
+        else:
+            self._add_registerData = self._add_registerData_2009
+
+        # Only build vendorExtensions containers for hooks that a subclass
+        # actually overrides. The default hooks never add anything.
+        self._addressBlock_vx = cls.addressBlock_vendorExtensions is not IPXACTExporter.addressBlock_vendorExtensions
+        self._registerFile_vx = cls.registerFile_vendorExtensions is not IPXACTExporter.registerFile_vendorExtensions
+        self._register_vx = cls.register_vendorExtensions is not IPXACTExporter.register_vendorExtensions
+        self._field_vx = cls.field_vendorExtensions is not IPXACTExporter.field_vendorExtensions
 
     #---------------------------------------------------------------------------
     def export(self, node: Union[AddrmapNode, RootNode], path: str, **kwargs: Any) -> None:
@@ -109,35 +225,38 @@ class IPXACTExporter:
                 node.inst.property_src_ref.get('bridge', node.inst.inst_src_ref)
             )
 
-        # Initialize XML DOM
-        self.doc = minidom.getDOMImplementation().createDocument(None, None, None)
+        # The writer emits many small strings per element. Collect the document
+        # in memory and write it to the file in one go. This also avoids
+        # leaving a partially written file behind if the export is aborted.
+        buf = io.BytesIO()
+        self.xg = XMLWriter(buf, self.xml_indent, self.xml_newline)
+        self.xg.startDocument()
+        self.xg.comment("Generated by PeakRDL IP-XACT (https://github.com/SystemRDL/PeakRDL-ipxact)")
+        self.add_component(node, component_name)
+        self.xg.endDocument()
+        self.xg = None
 
-        tmp = self.doc.createComment("Generated by PeakRDL IP-XACT (https://github.com/SystemRDL/PeakRDL-ipxact)")
-        self.doc.appendChild(tmp)
+        with open(path, "wb") as f:
+            f.write(buf.getbuffer())
 
-        # Create top-level component
-        comp = self.doc.createElement(self.ns + "component")
-        if self.standard == Standard.IEEE_1685_2014:
-            comp.setAttribute("xmlns:ipxact", "http://www.accellera.org/XMLSchema/IPXACT/1685-2014")
-            comp.setAttribute("xmlns:xsi", "http://www.w3.org/2001/XMLSchema-instance")
-            comp.setAttribute("xsi:schemaLocation", "http://www.accellera.org/XMLSchema/IPXACT/1685-2014 http://www.accellera.org/XMLSchema/IPXACT/1685-2014/index.xsd")
-        elif self.standard == Standard.IEEE_1685_2009:
-            comp.setAttribute("xmlns:spirit", "http://www.spiritconsortium.org/XMLSchema/SPIRIT/1685-2009")
-            comp.setAttribute("xmlns:xsi", "http://www.w3.org/2001/XMLSchema-instance")
-            comp.setAttribute("xsi:schemaLocation", "http://www.spiritconsortium.org/XMLSchema/SPIRIT/1685-2009 http://www.spiritconsortium.org/XMLSchema/SPIRIT/1685-2009/index.xsd")
+    #---------------------------------------------------------------------------
+    def add_component(self, node: Union[AddrmapNode, MemNode], component_name: str) -> None:
+        tags = self.tags
 
-        else:
-            raise RuntimeError
-        self.doc.appendChild(comp)
+        # Create top-level component
+        self.xg.startElement(tags["component"], {
+            "xmlns:" + self.ns_prefix: self.ns_uri,
+            "xmlns:xsi": XSI_NS,
+            "xsi:schemaLocation": "%s %s/index.xsd" % (self.ns_uri, self.ns_uri),
+        })
 
         # versionedIdentifier Block
-        self.add_value(comp, self.ns + "vendor", self.vendor)
-        self.add_value(comp, self.ns + "library", self.library)
-        self.add_value(comp, self.ns + "name", component_name)
-        self.add_value(comp, self.ns + "version", self.version)
+        self.add_value(tags["vendor"], self.vendor)
+        self.add_value(tags["library"], self.library)
+        self.add_value(tags["name"], component_name)
+        self.add_value(tags["version"], self.version)
 
-        mmaps = self.doc.createElement(self.ns + "memoryMaps")
-        comp.appendChild(mmaps)
+        self.xg.startElement(tags["memoryMaps"])
 
         # Determine if top-level node should be exploded across multiple
         # addressBlock groups
@@ -153,8 +272,10 @@ class IPXACTExporter:
         #
         # Otherwise, do not "explode" the top-level node
         # (explode --> False)
+        # The addrblockable children are kept so that they do not need to be
+        # looked up again if exploding
+        addrblockable_children = [] # type: List[AddressableNode]
         if isinstance(node, AddrmapNode):
-            addrblockable_children = 0
             non_addrblockable_children = 0
 
             for child in node.children(skip_not_present=self.skip_not_present):
@@ -162,102 +283,171 @@ class IPXACTExporter:
                     continue
 
                 if isinstance(child, (AddrmapNode, MemNode)) and not child.is_array:
-                    addrblockable_children += 1
+                    addrblockable_children.append(child)
                 else:
                     non_addrblockable_children += 1
 
-            if (non_addrblockable_children == 0) and (addrblockable_children >= 1):
+            if (non_addrblockable_children == 0) and addrblockable_children:
                 explode = True
 
         # Do the export!
         if explode:
             # top-node becomes the memoryMap
-            mmap = self.doc.createElement(self.ns + "memoryMap")
-            self.add_nameGroup(mmap,
+            self.xg.startElement(tags["memoryMap"])
+            self.add_nameGroup(
                 node.inst_name,
                 node.get_property("name", default=None),
                 node.get_property("desc")
             )
-            mmaps.appendChild(mmap)
 
             # Top-node's children become their own addressBlocks
-            for child in node.children(skip_not_present=self.skip_not_present):
-                if not isinstance(child, AddressableNode):
-                    continue
-
-                self.add_addressBlock(mmap, child)
+            for child in addrblockable_children:
+                self.add_addressBlock(child)
         else:
             # Not exploding apart the top-level node
 
             # Wrap it in a dummy memoryMap that bears its name
-            mmap = self.doc.createElement(self.ns + "memoryMap")
-            self.add_nameGroup(mmap, "%s_mmap" % node.inst_name)
-            mmaps.appendChild(mmap)
+            self.xg.startElement(tags["memoryMap"])
+            self.add_nameGroup("%s_mmap" % node.inst_name)
 
             # Export top-level node as a single addressBlock
-            self.add_addressBlock(mmap, node)
-
-        # Write out XML dom
-        with open(path, "w", encoding='utf-8') as f:
-            self.doc.writexml(
-                f,
-                addindent=self.xml_indent,
-                newl=self.xml_newline,
-                encoding="UTF-8"
-            )
+            self.add_addressBlock(node)
+
+        self.xg.endElement(tags["memoryMap"])
+        self.xg.endElement(tags["memoryMaps"])
+        self.xg.endElement(tags["component"])
+
+    #---------------------------------------------------------------------------
+    def add_value(self, tag: str, value: str) -> None:
+        self.xg.startElement(tag)
+        self.xg.characters(value)
+        self.xg.endElement(tag)
+
+    def add_dims(self, dims: List[int]) -> None:
+        xg = self.xg
+        tag = self.tags["dim"]
+        for dim in dims:
+            xg.startElement(tag)
+            xg.characters(str(dim))
+            xg.endElement(tag)
 
     #---------------------------------------------------------------------------
-    def add_value(self, parent: minidom.Element, tag: str, value: str) -> None:
-        el = self.doc.createElement(tag)
-        txt = self.doc.createTextNode(value)
-        el.appendChild(txt)
-        parent.appendChild(el)
+    def add_element(self, el: ElementTree.Element) -> None:
+        """
+        Emit an ElementTree element and all of its descendants.
+        Namespaced tags in Clark notation ({uri}tag) are mapped back to the
+        document's prefixes.
+        """
+        self._add_element(el, {})
+
+    def _add_element(self, el: ElementTree.Element, in_scope: Dict[str, str]) -> None:
+        # in_scope maps foreign namespace URIs to the prefixes already declared
+        # by an ancestor element
+
+        # Comments and processing instructions use a factory function as tag
+        tag = el.tag # type: Any
+        if tag is ElementTree.Comment:
+            self.xg.comment(el.text or "")
+            return
+        if tag is ElementTree.ProcessingInstruction:
+            target, _, data = (el.text or "").partition(" ")
+            self.xg.processingInstruction(target, data)
+            return
+
+        attrs = {} # type: Dict[str, str]
+        in_scope = dict(in_scope)
+        tag = self._qname(tag, attrs, in_scope)
+        for k, v in el.attrib.items():
+            attrs[self._qname(k, attrs, in_scope)] = v
+        self.xg.startElement(tag, attrs)
+        if el.text:
+            self.xg.characters(el.text)
+        for child in el:
+            self._add_element(child, in_scope)
+            if child.tail:
+                self.xg.characters(child.tail)
+        self.xg.endElement(tag)
+
+    def _qname(self, name: str, attrs: Dict[str, str], in_scope: Dict[str, str]) -> str:
+        if name[:1] != "{":
+            return name
+        uri, local = name[1:].split("}", 1)
+        if uri == self.ns_uri:
+            return self.ns + local
+        if uri == XSI_NS:
+            return "xsi:" + local
+        if uri == XML_NS:
+            # Reserved prefix. Always bound, and must never be declared
+            return "xml:" + local
+
+        # Foreign namespace. Declare it on the first element that uses it
+        prefix = in_scope.get(uri)
+        if prefix is None:
+            # Prefixes are numbered by how many are in scope, so a new one
+            # never shadows an ancestor's
+            prefix = "ns%d" % len(in_scope)
+            in_scope[uri] = prefix
+            attrs["xmlns:" + prefix] = uri
+        return prefix + ":" + local
 
     #---------------------------------------------------------------------------
-    def add_nameGroup(self, parent: minidom.Element, name: str, displayName: Optional[str]=None, description: Optional[str]=None) -> None:
-        self.add_value(parent, self.ns + "name", name)
+    def add_nameGroup(self, name: str, displayName: Optional[str]=None, description: Optional[str]=None) -> None:
+        tags = self.tags
+
+        self.add_value(tags["name"], name)
         if displayName is not None:
-            self.add_value(parent, self.ns + "displayName", displayName)
+            self.add_value(tags["displayName"], displayName)
         if description is not None:
-            self.add_value(parent, self.ns + "description", description)
+            self.add_value(tags["description"], description)
 
     #---------------------------------------------------------------------------
-    def add_registerData(self, parent: minidom.Element, node: RegNode) -> None:
-        if self.standard == Standard.IEEE_1685_2009:
-            # registers must all be listed before register files
-            for child in node.children(skip_not_present=self.skip_not_present):
-                if isinstance(child, RegNode):
-                    self.add_register(parent, child)
-
-            for child in node.children(skip_not_present=self.skip_not_present):
-                if isinstance(child, (AddrmapNode, RegfileNode)):
-                    self.add_registerFile(parent, child)
-                elif isinstance(child, MemNode):
-                    self.msg.warning(
-                        "IP-XACT does not support 'mem' nodes that are nested in hierarchy. Discarding '%s'"
-                        % child.get_path(),
-                        child.inst.inst_src_ref
-                    )
+    def add_registerData(self, node: Node) -> None:
+        if self.standard >= Standard.IEEE_1685_2014:
+            self._add_registerData_2014(node)
         else:
-            # registers and registerFiles can be interleaved
-            for child in node.children(skip_not_present=self.skip_not_present):
-                if isinstance(child, RegNode):
-                    self.add_register(parent, child)
-                elif isinstance(child, (AddrmapNode, RegfileNode)):
-                    self.add_registerFile(parent, child)
-                elif isinstance(child, MemNode):
-                    self.msg.warning(
-                        "IP-XACT does not support 'mem' nodes that are nested in hierarchy. Discarding '%s'"
-                        % child.get_path(),
-                        child.inst.inst_src_ref
-                    )
+            self._add_registerData_2009(node)
+
+    def _add_registerData_2009(self, node: Node) -> None:
+        # registers must all be listed before register files
+        # Split the children up in a single pass rather than iterating twice
+        regs = []
+        others = []
+        for child in node.children(skip_not_present=self.skip_not_present):
+            if isinstance(child, RegNode):
+                regs.append(child)
+            else:
+                others.append(child)
+
+        for child in regs:
+            self.add_register(child)
+
+        handlers = self._child_handlers
+        for child in others:
+            handler = handlers.get(type(child))
+            if handler is not None:
+                getattr(self, handler)(child)
+
+    def _add_registerData_2014(self, node: Node) -> None:
+        # registers and registerFiles can be interleaved
+        handlers = self._child_handlers
+        for child in node.children(skip_not_present=self.skip_not_present):
+            handler = handlers.get(type(child))
+            if handler is not None:
+                getattr(self, handler)(child)
+
+    def _warn_nested_mem(self, node: MemNode) -> None:
+        self.msg.warning(
+            "IP-XACT does not support 'mem' nodes that are nested in hierarchy. Discarding '%s'"
+            % node.get_path(),
+            node.inst.inst_src_ref
+        )
 
     #---------------------------------------------------------------------------
     def hex_str(self, v: int) -> str:
         if self.standard >= Standard.IEEE_1685_2014:
-            return "'h%x" % v
+            return _hex_2014(v)
         else:
-            return "0x%x" % v
+            return _hex_2009(v)
 
     #---------------------------------------------------------------------------
     def get_name(self, node: Node) -> str:
@@ -270,140 +460,158 @@ class IPXACTExporter:
         return node.raw_address_offset
 
     #---------------------------------------------------------------------------
-    def add_addressBlock(self, parent: minidom.Element, node: AddressableNode) -> None:
-        self._max_width = None
+    def add_addressBlock(self, node: AddressableNode) -> None:
+        tags = self.tags
 
-        addressBlock = self.doc.createElement(self.ns + "addressBlock")
-        parent.appendChild(addressBlock)
+        self.xg.startElement(tags["addressBlock"])
 
-        self.add_nameGroup(addressBlock,
+        self.add_nameGroup(
             self.get_name(node),
             node.get_property("name", default=None),
             node.get_property("desc")
         )
 
-        if self.standard.supports_isPresent and not node.get_property("ispresent"):
-            self.add_value(addressBlock, self.ns + "isPresent", "0")
+        if self._emit_ispresent and not _is_present(node):
+            self.add_value(tags["isPresent"], "0")
 
-        self.add_value(addressBlock, self.ns + "baseAddress", self.hex_str(node.absolute_address))
+        self.add_value(tags["baseAddress"], self._hex_str(node.absolute_address))
 
         # DNE: <spirit/ipxact:typeIdentifier>
 
-        self.add_value(addressBlock, self.ns + "range", self.hex_str(node.size))
+        self.add_value(tags["range"], self._hex_str(node.size))
 
         # RDL only encodes the bus-width at the register level, but IP-XACT
         # only encodes this at the addressBlock level!
-        # Insert the width element for now, but leave contents blank until it is
-        # determined later.
+        # Since the output is streamed, the width needs to be determined before
+        # any registers are written.
         # Exporter has no choice but to enforce a constant width throughout
-        width_el = self.doc.createElement(self.ns + "width")
-        addressBlock.appendChild(width_el)
 
+        # If there are no registers and it is a mem, use memwidth instead
         if isinstance(node, MemNode):
-            self.add_value(addressBlock, self.ns + "usage", "memory")
+            default_width = node.get_property("memwidth")
+        else:
+            default_width = 32
+        width = max(
+            (reg.get_property("regwidth") for reg in self._iter_regs(node)),
+            default=default_width
+        )
+        self.add_value(tags["width"], str(width))
+
+        if isinstance(node, MemNode):
+            self.add_value(tags["usage"], "memory")
             access = typemaps.access_from_sw(node.get_property("sw"))
-            self.add_value(addressBlock, self.ns + "access", access)
+            self.add_value(tags["access"], access)
 
         # DNE: <spirit/ipxact:volatile>
         # DNE: <spirit/ipxact:access>
         # DNE: <spirit/ipxact:parameters>
 
-        self.add_registerData(addressBlock, node)
+        self._add_registerData(node)
 
-        # Width should be known by now
-        # If mem, and width isn't known, check memwidth
-        if isinstance(node, MemNode) and (self._max_width is None):
-            self._max_width = node.get_property("memwidth")
+        if self._addressBlock_vx:
+            vendorExtensions = ElementTree.Element(self._vx_tag)
+            self.addressBlock_vendorExtensions(vendorExtensions, node)
+            if len(vendorExtensions):
+                self.add_element(vendorExtensions)
 
-        if self._max_width is not None:
-            width_el.appendChild(self.doc.createTextNode("%d" % self._max_width))
-        else:
-            width_el.appendChild(self.doc.createTextNode("32"))
+        self.xg.endElement(tags["addressBlock"])
 
-        vendorExtensions = self.doc.createElement(self.ns + "vendorExtensions")
-        self.addressBlock_vendorExtensions(vendorExtensions, node)
-        if vendorExtensions.hasChildNodes():
-            addressBlock.appendChild(vendorExtensions)
+    def _iter_regs(self, node: Node) -> Iterator[RegNode]:
+        # Yield the same registers that add_registerData() will export
+        for child in node.children(skip_not_present=self.skip_not_present):
+            if isinstance(child, RegNode):
+                yield child
+            elif isinstance(child, (AddrmapNode, RegfileNode)):
+                yield from self._iter_regs(child)
 
     #---------------------------------------------------------------------------
-    def add_registerFile(self, parent: minidom.Element, node: Union[RegfileNode, AddrmapNode]) -> None:
-        registerFile = self.doc.createElement(self.ns + "registerFile")
-        parent.appendChild(registerFile)
+    def add_registerFile(self, node: Union[RegfileNode, AddrmapNode]) -> None:
+        tags = self.tags
+
+        self.xg.startElement(tags["registerFile"])
 
-        self.add_nameGroup(registerFile,
+        self.add_nameGroup(
             self.get_name(node),
             node.get_property("name", default=None),
             node.get_property("desc")
         )
 
-        if self.standard.supports_isPresent and not node.get_property("ispresent"):
-            self.add_value(registerFile, self.ns + "isPresent", "0")
+        if self._emit_ispresent and not _is_present(node):
+            self.add_value(tags["isPresent"], "0")
 
         if node.is_array:
-            for dim in node.array_dimensions:
-                self.add_value(registerFile, self.ns + "dim", "%d" % dim)
+            self.add_dims(node.array_dimensions)
 
-        self.add_value(registerFile, self.ns + "addressOffset", self.hex_str(self.get_regfile_addr_offset(node)))
+        self.add_value(tags["addressOffset"], self._hex_str(self.get_regfile_addr_offset(node)))
 
         # DNE: <spirit/ipxact:typeIdentifier>
 
         if node.is_array:
             # For arrays, ipxact:range also defines the increment between indexes
             # Must use stride instead
-            self.add_value(registerFile, self.ns + "range", self.hex_str(node.array_stride))
+            self.add_value(tags["range"], self._hex_str(node.array_stride))
         else:
-            self.add_value(registerFile, self.ns + "range", self.hex_str(node.size))
+            self.add_value(tags["range"], self._hex_str(node.size))
 
-        self.add_registerData(registerFile, node)
+        self._add_registerData(node)
 
         # DNE: <spirit/ipxact:parameters>
 
-        vendorExtensions = self.doc.createElement(self.ns + "vendorExtensions")
-        self.registerFile_vendorExtensions(vendorExtensions, node)
-        if vendorExtensions.hasChildNodes():
-            registerFile.appendChild(vendorExtensions)
+        if self._registerFile_vx:
+            vendorExtensions = ElementTree.Element(self._vx_tag)
+            self.registerFile_vendorExtensions(vendorExtensions, node)
+            if len(vendorExtensions):
+                self.add_element(vendorExtensions)
+
+        self.xg.endElement(tags["registerFile"])
 
     #---------------------------------------------------------------------------
-    def add_register(self, parent: minidom.Element, node: RegNode) -> None:
-        register = self.doc.createElement(self.ns + "register")
-        parent.appendChild(register)
+    def add_register(self, node: RegNode) -> None:
+        # Bind frequently used attributes to locals
+        tags = self.tags
+        xg = self.xg
+        add_value = self.add_value
+        hex_str = self._hex_str
+
+        xg.startElement(tags["register"])
 
-        self.add_nameGroup(register,
+        self.add_nameGroup(
             self.get_name(node),
             node.get_property("name", default=None),
             node.get_property("desc")
         )
 
-        if self.standard.supports_isPresent and not node.get_property("ispresent"):
-            self.add_value(register, self.ns + "isPresent", "0")
+        if self._emit_ispresent and not _is_present(node):
+            add_value(tags["isPresent"], "0")
+
+        regwidth = node.get_property("regwidth")
 
         if node.is_array:
-            if node.array_stride != (node.get_property("regwidth") / 8):
+            if node.array_stride != (regwidth / 8):
                 self.msg.fatal(
                     "IP-XACT does not support register arrays whose stride is larger then the register's size",
                     node.inst.inst_src_ref
                 )
-            for dim in node.array_dimensions:
-                self.add_value(register, self.ns + "dim", "%d" % dim)
+            self.add_dims(node.array_dimensions)
 
-        self.add_value(register, self.ns + "addressOffset", self.hex_str(self.get_reg_addr_offset(node)))
+        add_value(tags["addressOffset"], hex_str(self.get_reg_addr_offset(node)))
 
         # DNE: <spirit/ipxact:typeIdentifier>
 
-        self.add_value(register, self.ns + "size", "%d" % node.get_property("regwidth"))
-
-        if self._max_width is None:
-            self._max_width = node.get_property("regwidth")
-        else:
-            self._max_width = max(node.get_property("regwidth"), self._max_width)
+        add_value(tags["size"], str(regwidth))
 
         # DNE: <spirit/ipxact:volatile>
         # DNE: <spirit/ipxact:access>
 
-        if self.standard <= Standard.IEEE_1685_2009:
+        # The register's fields are needed twice for 2009. Only walk them once.
+        fields = list(node.fields(skip_not_present=self.skip_not_present))
+
+        if not self._field_resets:
+            # Register-level reset must be written before the fields, so it is
+            # accumulated up-front
             reset = 0
             mask = 0
-            for field in node.fields(skip_not_present=self.skip_not_present):
+            for field in fields:
                 field_reset = field.get_property("reset")
                 if isinstance(field_reset, int):
                     field_mask = ((1 << field.width) - 1) << field.lsb
@@ -412,81 +620,112 @@ class IPXACTExporter:
                     mask |= field_mask
 
             if mask != 0:
-                reset_el = self.doc.createElement(self.ns + "reset")
-                register.appendChild(reset_el)
-                self.add_value(reset_el, self.ns + "value", self.hex_str(reset))
-                self.add_value(reset_el, self.ns + "mask", self.hex_str(mask))
+                xg.startElement(tags["reset"])
+                add_value(tags["value"], hex_str(reset))
+                add_value(tags["mask"], hex_str(mask))
+                xg.endElement(tags["reset"])
 
-        for field in node.fields(skip_not_present=self.skip_not_present):
-            self.add_field(register, field)
+        for field in fields:
+            self.add_field(field)
 
         # DNE: <spirit/ipxact:alternateRegisters> [...]
         # DNE: <spirit/ipxact:parameters>
 
-        vendorExtensions = self.doc.createElement(self.ns + "vendorExtensions")
-        self.register_vendorExtensions(vendorExtensions, node)
-        if vendorExtensions.hasChildNodes():
-            register.appendChild(vendorExtensions)
+        if self._register_vx:
+            vendorExtensions = ElementTree.Element(self._vx_tag)
+            self.register_vendorExtensions(vendorExtensions, node)
+            if len(vendorExtensions):
+                self.add_element(vendorExtensions)
 
-    #---------------------------------------------------------------------------
-    def add_field(self, parent: minidom.Element, node: FieldNode) -> None:
-        field = self.doc.createElement(self.ns + "field")
-        parent.appendChild(field)
+        xg.endElement(tags["register"])
 
-        self.add_nameGroup(field,
+    #---------------------------------------------------------------------------
+    def add_field(self, node: FieldNode) -> None:
+        # Bind frequently used attributes to locals
+        tags = self.tags
+        xg = self.xg
+        add_value = self.add_value
+        hex_str = self._hex_str
+
+        # Properties whose default is a constant are read directly from the
+        # instance. This skips get_property()'s rulebook lookup when the
+        # property was not assigned, which is the common case.
+        # (onread and onwrite can have implied defaults, and sw's default is
+        # left to the rulebook, so those still use get_property())
+        prop = node.inst.properties.get
+
+        xg.startElement(tags["field"])
+
+        self.add_nameGroup(
             self.get_name(node),
-            node.get_property("name", default=None),
-            node.get_property("desc")
+            prop("name"),
+            prop("desc")
         )
 
-        if self.standard.supports_isPresent and not node.get_property("ispresent"):
-            self.add_value(field, self.ns + "isPresent", "0")
+        if self._emit_ispresent and not _is_present(node):
+            add_value(tags["isPresent"], "0")
 
-        self.add_value(field, self.ns + "bitOffset", "%d" % node.low)
+        add_value(tags["bitOffset"], str(node.low))
 
-        if self.standard >= Standard.IEEE_1685_2014:
-            reset = node.get_property("reset")
+        if self._field_resets:
+            reset = prop("reset")
             if isinstance(reset, int):
-                resets_el = self.doc.createElement(self.ns + "resets")
-                field.appendChild(resets_el)
-                reset_el = self.doc.createElement(self.ns + "reset")
-                resets_el.appendChild(reset_el)
-                self.add_value(reset_el, self.ns + "value", self.hex_str(reset))
+                xg.startElement(tags["resets"])
+                xg.startElement(tags["reset"])
+                add_value(tags["value"], hex_str(reset))
+                xg.endElement(tags["reset"])
+                xg.endElement(tags["resets"])
 
         # DNE: <spirit/ipxact:typeIdentifier>
 
-        self.add_value(field, self.ns + "bitWidth", "%d" % node.width)
+        add_value(tags["bitWidth"], str(node.width))
 
         if node.is_volatile:
-            self.add_value(field, self.ns + "volatile", "true")
+            add_value(tags["volatile"], "true")
 
         sw = node.get_property("sw")
-        self.add_value(
-            field,
-            self.ns + "access",
+        add_value(
+            tags["access"],
             typemaps.access_from_sw(sw)
         )
 
-        encode = node.get_property("encode")
+        encode = prop("encode")
         if encode is not None:
-            enum_values_el = self.doc.createElement(self.ns + "enumeratedValues")
-            field.appendChild(enum_values_el)
+            # Emitted inline since this is the highest-cardinality loop
+            start = xg.startElement
+            end = xg.endElement
+            characters = xg.characters
+            ev_tag = tags["enumeratedValue"]
+            name_tag = tags["name"]
+            displayName_tag = tags["displayName"]
+            description_tag = tags["description"]
+            value_tag = tags["value"]
+
+            start(tags["enumeratedValues"])
             for enum_value in encode:
-                enum_value_el = self.doc.createElement(self.ns + "enumeratedValue")
-                enum_values_el.appendChild(enum_value_el)
-                self.add_nameGroup(enum_value_el,
-                    enum_value.name,
-                    enum_value.rdl_name,
-                    enum_value.rdl_desc
-                )
-                self.add_value(enum_value_el, self.ns + "value", self.hex_str(enum_value.value))
+                start(ev_tag)
+                start(name_tag)
+                characters(enum_value.name)
+                end(name_tag)
+                if enum_value.rdl_name is not None:
+                    start(displayName_tag)
+                    characters(enum_value.rdl_name)
+                    end(displayName_tag)
+                if enum_value.rdl_desc is not None:
+                    start(description_tag)
+                    characters(enum_value.rdl_desc)
+                    end(description_tag)
+                start(value_tag)
+                characters(hex_str(enum_value.value))
+                end(value_tag)
                 # DNE <spirit/ipxact:vendorExtensions>
+                end(ev_tag)
+            end(tags["enumeratedValues"])
 
         onwrite = node.get_property("onwrite")
         if onwrite:
-            self.add_value(
-                field,
-                self.ns + "modifiedWriteValue",
+            add_value(
+                tags["modifiedWriteValue"],
                 typemaps.mwv_from_onwrite(onwrite)
             )
 
@@ -494,33 +733,35 @@ class IPXACTExporter:
 
         onread = node.get_property("onread")
         if onread:
-            self.add_value(
-                field,
-                self.ns + "readAction",
+            add_value(
+                tags["readAction"],
                 typemaps.readaction_from_onread(onread)
             )
 
-        if node.get_property("donttest"):
-            self.add_value(field, self.ns + "testable", "false")
+        if prop("donttest", False):
+            add_value(tags["testable"], "false")
 
         # DNE: <ipxact:reserved>
 
         # DNE: <spirit/ipxact:parameters>
 
-        vendorExtensions = self.doc.createElement(self.ns + "vendorExtensions")
-        self.field_vendorExtensions(vendorExtensions, node)
-        if vendorExtensions.hasChildNodes():
-            field.appendChild(vendorExtensions)
+        if self._field_vx:
+            vendorExtensions = ElementTree.Element(self._vx_tag)
+            self.field_vendorExtensions(vendorExtensions, node)
+            if len(vendorExtensions):
+                self.add_element(vendorExtensions)
+
+        xg.endElement(tags["field"])
 
     #---------------------------------------------------------------------------
-    def addressBlock_vendorExtensions(self, parent:minidom.Element, node:AddressableNode) -> None:
+    def addressBlock_vendorExtensions(self, parent:ElementTree.Element, node:AddressableNode) -> None:
         pass
 
-    def registerFile_vendorExtensions(self, parent:minidom.Element, node:AddressableNode) -> None:
+    def registerFile_vendorExtensions(self, parent:ElementTree.Element, node:AddressableNode) -> None:
         pass
 
-    def register_vendorExtensions(self, parent:minidom.Element, node:RegNode) -> None:
+    def register_vendorExtensions(self, parent:ElementTree.Element, node:RegNode) -> None:
         pass
 
-    def field_vendorExtensions(self, parent:minidom.Element, node:FieldNode) -> None:
+    def field_vendorExtensions(self, parent:ElementTree.Element, node:FieldNode) -> None:
         pass
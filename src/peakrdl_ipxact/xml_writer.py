@@ -0,0 +1,67 @@
+from typing import Any
+from xml.sax.saxutils import XMLGenerator
+from xml.sax.xmlreader import AttributesImpl
+
+NO_ATTRS = AttributesImpl({})
+
+
+class XMLWriter(XMLGenerator):
+    """
+    SAX XML generator that pretty-prints the document as it is streamed out.
+
+    Elements that only contain text are kept on a single line.
+    """
+    def __init__(self, out: Any, indent: str, newline: str) -> None:
+        super().__init__(out, encoding="UTF-8", short_empty_elements=True)
+        self.indent = indent
+        self.newline = newline
+
+        # Current element nesting depth
+        self._depth = 0
+
+        # Whether the currently open element contains any child elements
+        self._has_children = False
+
+    def _write_raw(self, content: str) -> None:
+        # ignorableWhitespace() writes its content out verbatim
+        self.ignorableWhitespace(content)
+
+    def startDocument(self) -> None:
+        self._write_raw('<?xml version="1.0" encoding="UTF-8"?>' + self.newline)
+
+    def _write_node(self, markup: str) -> None:
+        # Write a comment or processing instruction on its own line
+        if self._depth:
+            self._write_raw(self.newline + self.indent * self._depth + markup)
+            self._has_children = True
+        else:
+            self._write_raw(markup + self.newline)
+
+    def comment(self, content: str) -> None:
+        if "--" in content or content.endswith("-"):
+            raise ValueError("'--' is not allowed in a comment node")
+        self._write_node("<!--%s-->" % content)
+
+    def processingInstruction(self, target: str, data: str) -> None:
+        if "?>" in target or "?>" in data:
+            raise ValueError("'?>' is not allowed in a processing instruction")
+        if data:
+            self._write_node("<?%s %s?>" % (target, data))
+        else:
+            self._write_node("<?%s?>" % target)
+
+    def startElement(self, name: str, attrs: Any = None) -> None:
+        if self._depth:
+            self._write_raw(self.newline + self.indent * self._depth)
+        super().startElement(name, attrs if attrs is not None else NO_ATTRS)
+        self._depth += 1
+        self._has_children = False
+
+    def endElement(self, name: str) -> None:
+        self._depth -= 1
+        if self._has_children:
+            self._write_raw(self.newline + self.indent * self._depth)
+        super().endElement(name)
+        self._has_children = True
+        if not self._depth:
+            self._write_raw(self.newline)
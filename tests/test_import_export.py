@@ -1,12 +1,18 @@
 import os
+from xml.etree import ElementTree
 
-from peakrdl_ipxact.exporter import Standard
+from peakrdl_ipxact import IPXACTExporter
+from peakrdl_ipxact.exporter import Standard, NAMESPACES
 
 from .unittest_utils import IPXACTTestCase
 
 from systemrdl.node import RegNode, FieldNode, MemNode
 from systemrdl.rdltypes.builtin_enums import AccessType
 
+class PaddedHexExporter(IPXACTExporter):
+    def hex_str(self, v):
+        return "0x%08x" % v
+
 class TestImportExport(IPXACTTestCase):
 
     def symmetry_check(self, sources, std):
@@ -97,3 +103,22 @@ class TestImportExport(IPXACTTestCase):
         field = root.find_by_path('top.some_other_reg.f2')
         self.assertIsNotNone(field)
         self.assertEqual(field.get_property("sw"), AccessType.r)
+
+    def test_hex_str_override(self):
+        this_dir = os.path.dirname(os.path.realpath(__file__))
+        root = self.compile([
+            os.path.join(this_dir, "test_sources/accellera-generic_example.rdl")
+        ])
+
+        for std in (Standard.IEEE_1685_2014, Standard.IEEE_1685_2009):
+            with self.subTest(std=std):
+                xml_path = "%s_%d.xml" % (os.path.join(self.tempdir.name, self.id()), std)
+                PaddedHexExporter(standard=std).export(root, xml_path)
+
+                ns = "{%s}" % NAMESPACES[std][1]
+                tree = ElementTree.parse(xml_path)
+                for path in ("addressOffset", "range", "reset/" + ns + "value"):
+                    elements = tree.findall(".//" + ns + path)
+                    self.assertTrue(elements, path)
+                    for el in elements:
+                        self.assertRegex(el.text, r"^0x[0-9a-f]{8}$")
@@ -0,0 +1,125 @@
+import os
+import subprocess
+from xml.etree import ElementTree
+
+from peakrdl_ipxact import IPXACTExporter
+from peakrdl_ipxact.exporter import Standard, NAMESPACES
+
+from .unittest_utils import IPXACTTestCase
+
+VX_NS = "http://example.com/vx"
+XML_NS = "http://www.w3.org/XML/1998/namespace"
+
+class MixedExporter(IPXACTExporter):
+    def register_vendorExtensions(self, parent, node):
+        ElementTree.SubElement(parent, "{%s}note" % self.ns_uri).text = node.inst_name
+        info = ElementTree.SubElement(
+            parent, "{%s}info" % VX_NS,
+            {"{%s}kind" % VX_NS: "reg", "{%s}lang" % XML_NS: "en"}
+        )
+        info.text = "a < b & c"
+        group = ElementTree.SubElement(parent, "{%s}group" % VX_NS)
+        ElementTree.SubElement(group, "{%s}detail" % VX_NS).text = "d"
+        parent.append(ElementTree.Comment(" hello "))
+        parent.append(ElementTree.ProcessingInstruction("my-tool", "opt=1"))
+
+class BadCommentExporter(IPXACTExporter):
+    def field_vendorExtensions(self, parent, node):
+        parent.append(ElementTree.Comment(" a -- b "))
+
+def add_path(self, parent, node):
+    ElementTree.SubElement(parent, "{%s}path" % VX_NS).text = node.get_path()
+
+
+class TestVendorExtensions(IPXACTTestCase):
+
+    def setUp(self):
+        super().setUp()
+        this_dir = os.path.dirname(os.path.realpath(__file__))
+        self.root = self.compile([
+            os.path.join(this_dir, "test_sources/accellera-generic_example.rdl")
+        ])
+
+    def check_well_formed(self, file):
+        try:
+            subprocess.check_output(
+                ["xmllint", "--noout", file],
+                stderr=subprocess.STDOUT
+            )
+        except subprocess.CalledProcessError as e:
+            raise AssertionError("XML is not well-formed: %s" % e.output.decode("utf-8"))
+
+    def test_hook_namespaces(self):
+        xml_path = "%s.xml" % os.path.join(self.tempdir.name, self.id())
+        MixedExporter().export(self.root, xml_path)
+
+        self.check_well_formed(xml_path)
+
+        ns = "{%s}" % NAMESPACES[Standard.IEEE_1685_2014][1]
+        tree = ElementTree.parse(xml_path)
+        registers = list(tree.iter(ns + "register"))
+        self.assertTrue(registers)
+        for register in registers:
+            vx = register.find(ns + "vendorExtensions")
+            self.assertIsNotNone(vx)
+
+            note = vx.find(ns + "note")
+            self.assertIsNotNone(note)
+            self.assertEqual(note.text, register.find(ns + "name").text)
+
+            info = vx.find("{%s}info" % VX_NS)
+            self.assertIsNotNone(info)
+            self.assertEqual(info.text, "a < b & c")
+            self.assertEqual(info.get("{%s}kind" % VX_NS), "reg")
+            self.assertEqual(info.get("{%s}lang" % XML_NS), "en")
+            self.assertEqual(vx.find("{%s}group/{%s}detail" % (VX_NS, VX_NS)).text, "d")
+
+        with open(xml_path, encoding="utf-8") as f:
+            text = f.read()
+        self.assertIn('xml:lang="en"', text)
+        self.assertNotIn('="%s"' % XML_NS, text)
+        self.assertEqual(text.count("<!-- hello -->"), len(registers))
+        self.assertEqual(text.count("<?my-tool opt=1?>"), len(registers))
+
+        # The foreign namespace is declared on info and group, but not again
+        # on the nested detail element
+        self.assertEqual(text.count('="%s"' % VX_NS), 2 * len(registers))
+
+    def test_invalid_comment(self):
+        xml_path = "%s.xml" % os.path.join(self.tempdir.name, self.id())
+        with self.assertRaises(ValueError):
+            BadCommentExporter().export(self.root, xml_path)
+
+    def test_overridden_hook_only(self):
+        # A subclass that overrides a single hook must only get
+        # vendorExtensions on that kind of element
+        for kind in ("addressBlock", "registerFile", "register", "field"):
+            cls = type(
+                "%sOnlyExporter" % kind, (IPXACTExporter,),
+                {"%s_vendorExtensions" % kind: add_path}
+            )
+            for std in (Standard.IEEE_1685_2014, Standard.IEEE_1685_2009):
+                with self.subTest(kind=kind, std=std):
+                    xml_path = "%s_%s_%d.xml" % (os.path.join(self.tempdir.name, self.id()), kind, std)
+                    cls(standard=std).export(self.root, xml_path)
+
+                    with self.subTest("validate xsd"):
+                        self.validate_xsd(xml_path, self.get_schema_path(std))
+
+                    ns = "{%s}" % NAMESPACES[std][1]
+                    tree = ElementTree.parse(xml_path)
+                    elements = list(tree.iter(ns + kind))
+                    self.assertTrue(elements)
+                    for el in elements:
+                        vx = el.find(ns + "vendorExtensions")
+                        self.assertIsNotNone(vx)
+                        self.assertIsNotNone(vx.find("{%s}path" % VX_NS))
+
+                    all_vx = list(tree.iter(ns + "vendorExtensions"))
+                    self.assertEqual(len(all_vx), len(elements))
+
+    def test_no_hooks_overridden(self):
+        xml_path = "%s.xml" % os.path.join(self.tempdir.name, self.id())
+        IPXACTExporter().export(self.root, xml_path)
+        with open(xml_path, encoding="utf-8") as f:
+            self.assertNotIn("vendorExtensions", f.read())